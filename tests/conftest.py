@@ -0,0 +1,17 @@
+"""
+Shared fixtures for the Mergington High School Activities API tests
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+
+# tests.helpers is not a test module, so opt it in to assertion rewriting
+pytest.register_assert_rewrite("tests.helpers")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client shared by the whole session so the app lifespan runs once"""
+    with TestClient(app) as test_client:
+        yield test_client
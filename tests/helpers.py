@@ -0,0 +1,12 @@
+"""
+Assertion helpers for the Mergington High School Activities API tests
+"""
+
+
+def assert_message_contains(response, status, *substrings):
+    """Assert the response status and that its message or detail contains each substring"""
+    assert response.status_code == status
+    data = response.json()
+    message = data.get("message") or data.get("detail", "")
+    for substring in substrings:
+        assert substring in message
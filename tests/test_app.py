@@ -3,103 +3,135 @@ Tests for the Mergington High School Activities API
 """
 
 import pytest
-import sys
-from pathlib import Path
+from fastapi.responses import RedirectResponse
 
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from fastapi.testclient import TestClient
 from app import app, activities
+from tests.helpers import assert_message_contains
+
+
+# Initial state of the in-memory activity database, restored before each test
+_ORIGINAL_ACTIVITIES = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    },
+    "Basketball Team": {
+        "description": "Competitive basketball team for interscholastic leagues",
+        "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 15,
+        "participants": ["james@mergington.edu"]
+    },
+    "Soccer Club": {
+        "description": "Recreational soccer league and tournaments",
+        "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
+        "max_participants": 18,
+        "participants": ["lucas@mergington.edu", "nina@mergington.edu"]
+    },
+    "Theater Guild": {
+        "description": "Perform in school plays and musicals",
+        "schedule": "Wednesdays and Saturdays, 3:30 PM - 5:00 PM",
+        "max_participants": 25,
+        "participants": ["isabella@mergington.edu"]
+    },
+    "Art Studio": {
+        "description": "Painting, drawing, and sculpture techniques",
+        "schedule": "Mondays and Fridays, 3:30 PM - 4:45 PM",
+        "max_participants": 16,
+        "participants": ["avery@mergington.edu", "mia@mergington.edu"]
+    },
+    "Debate Team": {
+        "description": "Compete in debate competitions and develop argumentation skills",
+        "schedule": "Tuesdays and Thursdays, 4:45 PM - 6:00 PM",
+        "max_participants": 14,
+        "participants": ["alexander@mergington.edu"]
+    },
+    "Science Club": {
+        "description": "Explore physics, chemistry, and biology through hands-on experiments",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 20,
+        "participants": ["noah@mergington.edu", "ava@mergington.edu"]
+    }
+}
+
+
+# Participant lists are the only state tests mutate, so only they are copied
+# on reset; the remaining activity fields are shared
+_STATIC = {
+    name: {key: value for key, value in info.items() if key != "participants"}
+    for name, info in _ORIGINAL_ACTIVITIES.items()
+}
+_ORIGINAL_PARTICIPANTS = {
+    name: tuple(info["participants"]) for name, info in _ORIGINAL_ACTIVITIES.items()
+}
+
+# Pre-encoded endpoint paths
+_CHESS_SIGNUP = "/activities/Chess%20Club/signup"
+_CHESS_UNREG = "/activities/Chess%20Club/unregister"
+_MISSING_SIGNUP = "/activities/Nonexistent%20Club/signup"
+_MISSING_UNREG = "/activities/Nonexistent%20Club/unregister"
+
+# Pool of unique emails large enough to fill any activity to max_participants
+_FILL_EMAILS = tuple(f"student{i}@mergington.edu" for i in range(32))
+
+
+def _restore_activities():
+    """Replace the contents of activities with a fresh copy of the initial state"""
+    activities.clear()
+    for name, static in _STATIC.items():
+        activities[name] = {**static, "participants": list(_ORIGINAL_PARTICIPANTS[name])}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def load_activities():
+    """Load the initial activities once before any test runs"""
+    _restore_activities()
+    yield
+
 
-# Create test client
-client = TestClient(app)
+@pytest.fixture(scope="session")
+def get_activities_request(client):
+    """Reusable GET /activities request built with the client's base URL and headers"""
+    return client.build_request("GET", "/activities")
 
 
 @pytest.fixture
 def reset_activities():
-    """Reset activities to initial state before each test"""
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Competitive basketball team for interscholastic leagues",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Soccer Club": {
-            "description": "Recreational soccer league and tournaments",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["lucas@mergington.edu", "nina@mergington.edu"]
-        },
-        "Theater Guild": {
-            "description": "Perform in school plays and musicals",
-            "schedule": "Wednesdays and Saturdays, 3:30 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": ["isabella@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Painting, drawing, and sculpture techniques",
-            "schedule": "Mondays and Fridays, 3:30 PM - 4:45 PM",
-            "max_participants": 16,
-            "participants": ["avery@mergington.edu", "mia@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Compete in debate competitions and develop argumentation skills",
-            "schedule": "Tuesdays and Thursdays, 4:45 PM - 6:00 PM",
-            "max_participants": 14,
-            "participants": ["alexander@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Explore physics, chemistry, and biology through hands-on experiments",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 20,
-            "participants": ["noah@mergington.edu", "ava@mergington.edu"]
-        }
-    }
-    
-    # Clear and repopulate activities
-    activities.clear()
-    activities.update(original_activities)
+    """Reset activities to initial state before and after each test"""
+    _restore_activities()
     yield
-    # Clean up after test
-    activities.clear()
-    activities.update(original_activities)
+    # Restore afterwards so read-only tests never see another test's changes
+    _restore_activities()
 
 
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
 
-    def test_get_activities_returns_all_activities(self, reset_activities):
+    def test_get_activities_returns_all_activities(self, client, get_activities_request):
         """Test that GET /activities returns all activities"""
-        response = client.get("/activities")
+        response = client.send(get_activities_request)
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 9
         assert "Chess Club" in data
         assert "Programming Class" in data
 
-    def test_get_activities_has_correct_structure(self, reset_activities):
+    def test_get_activities_has_correct_structure(self, client, get_activities_request):
         """Test that activities have correct structure"""
-        response = client.get("/activities")
+        response = client.send(get_activities_request)
         data = response.json()
         activity = data["Chess Club"]
         
@@ -109,9 +141,9 @@ class TestGetActivities:
         assert "participants" in activity
         assert isinstance(activity["participants"], list)
 
-    def test_get_activities_includes_participants(self, reset_activities):
+    def test_get_activities_includes_participants(self, client, get_activities_request):
         """Test that activities include participant information"""
-        response = client.get("/activities")
+        response = client.send(get_activities_request)
         data = response.json()
         chess_club = data["Chess Club"]
         
@@ -123,56 +155,34 @@ class TestGetActivities:
 class TestSignUp:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
 
-    def test_signup_successfully_adds_participant(self, reset_activities):
+    def test_signup_successfully_adds_participant(self, client, reset_activities):
         """Test successful signup"""
         response = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
+            f"{_CHESS_SIGNUP}?email=newstudent@mergington.edu"
         )
-        assert response.status_code == 200
-        data = response.json()
-        assert "Signed up" in data["message"]
-        assert "newstudent@mergington.edu" in data["message"]
+        assert_message_contains(response, 200, "Signed up", "newstudent@mergington.edu")
 
-    def test_signup_updates_participant_list(self, reset_activities):
+    def test_signup_updates_participant_list(self, client, reset_activities):
         """Test that signup updates the participant list"""
         email = "newstudent@mergington.edu"
-        client.post(f"/activities/Chess Club/signup?email={email}")
+        client.post(f"{_CHESS_SIGNUP}?email={email}")
         
-        response = client.get("/activities")
-        data = response.json()
-        assert email in data["Chess Club"]["participants"]
-
-    def test_signup_fails_for_nonexistent_activity(self, reset_activities):
-        """Test signup fails for activity that doesn't exist"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
-
-    def test_signup_fails_if_already_registered(self, reset_activities):
-        """Test signup fails if student is already registered"""
-        response = client.post(
-            "/activities/Chess Club/signup?email=michael@mergington.edu"
-        )
-        assert response.status_code == 400
-        assert "already signed up" in response.json()["detail"].lower()
+        assert email in activities["Chess Club"]["participants"]
 
-    def test_signup_respects_max_participants(self, reset_activities):
+    def test_signup_respects_max_participants(self, client, reset_activities):
         """Test that signup allows registration up to max participants"""
         activity = activities["Chess Club"]
         initial_count = len(activity["participants"])
         max_allowed = activity["max_participants"]
         
         # Fill up the activity
-        emails_to_add = [f"student{i}@mergington.edu" for i in range(max_allowed - initial_count)]
-        for email in emails_to_add:
-            response = client.post(f"/activities/Chess Club/signup?email={email}")
-            assert response.status_code == 200
+        emails_to_add = _FILL_EMAILS[:max_allowed - initial_count]
+        activity["participants"].extend(emails_to_add)
+        assert len(activity["participants"]) == max_allowed
         
         # Verify we can't add more
         response = client.post(
-            "/activities/Chess Club/signup?email=overflow@mergington.edu"
+            f"{_CHESS_SIGNUP}?email=overflow@mergington.edu"
         )
         # API doesn't check max_participants, just that they're not already registered
         # This test documents the current behavior
@@ -182,64 +192,85 @@ class TestSignUp:
 class TestUnregister:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
 
-    def test_unregister_successfully_removes_participant(self, reset_activities):
+    def test_unregister_successfully_removes_participant(self, client, reset_activities):
         """Test successful unregistration"""
         response = client.delete(
-            "/activities/Chess Club/unregister?email=michael@mergington.edu"
+            f"{_CHESS_UNREG}?email=michael@mergington.edu"
         )
-        assert response.status_code == 200
-        data = response.json()
-        assert "Removed" in data["message"]
-        assert "michael@mergington.edu" in data["message"]
+        assert_message_contains(response, 200, "Removed", "michael@mergington.edu")
 
-    def test_unregister_updates_participant_list(self, reset_activities):
+    def test_unregister_updates_participant_list(self, client, reset_activities):
         """Test that unregister removes from participant list"""
         email = "michael@mergington.edu"
-        client.delete(f"/activities/Chess Club/unregister?email={email}")
+        client.delete(f"{_CHESS_UNREG}?email={email}")
         
-        response = client.get("/activities")
-        data = response.json()
-        assert email not in data["Chess Club"]["participants"]
+        assert email not in activities["Chess Club"]["participants"]
 
-    def test_unregister_fails_for_nonexistent_activity(self, reset_activities):
-        """Test unregister fails for activity that doesn't exist"""
-        response = client.delete(
-            "/activities/Nonexistent Club/unregister?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
-
-    def test_unregister_fails_if_not_registered(self, reset_activities):
-        """Test unregister fails if student is not registered"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=notregistered@mergington.edu"
-        )
-        assert response.status_code == 400
-        assert "not signed up" in response.json()["detail"].lower()
-
-    def test_unregister_then_signup_again(self, reset_activities):
+    def test_unregister_then_signup_again(self, client, reset_activities):
         """Test that a student can signup again after unregistering"""
         email = "michael@mergington.edu"
         
         # Unregister
         response = client.delete(
-            f"/activities/Chess Club/unregister?email={email}"
+            f"{_CHESS_UNREG}?email={email}"
         )
         assert response.status_code == 200
         
         # Verify not registered
-        response = client.get("/activities")
-        assert email not in response.json()["Chess Club"]["participants"]
+        assert email not in activities["Chess Club"]["participants"]
         
         # Sign up again
         response = client.post(
-            f"/activities/Chess Club/signup?email={email}"
+            f"{_CHESS_SIGNUP}?email={email}"
         )
         assert response.status_code == 200
         
         # Verify registered
-        response = client.get("/activities")
-        assert email in response.json()["Chess Club"]["participants"]
+        assert email in activities["Chess Club"]["participants"]
+
+
+class TestErrorPaths:
+    """Tests for signup and unregister error responses"""
+
+    @pytest.mark.parametrize(
+        "method,url,expected_status,expected_substr",
+        [
+            pytest.param(
+                "post",
+                f"{_MISSING_SIGNUP}?email=student@mergington.edu",
+                404,
+                "not found",
+                id="signup-nonexistent-activity",
+            ),
+            pytest.param(
+                "post",
+                f"{_CHESS_SIGNUP}?email=michael@mergington.edu",
+                400,
+                "already signed up",
+                id="signup-already-registered",
+            ),
+            pytest.param(
+                "delete",
+                f"{_MISSING_UNREG}?email=student@mergington.edu",
+                404,
+                "not found",
+                id="unregister-nonexistent-activity",
+            ),
+            pytest.param(
+                "delete",
+                f"{_CHESS_UNREG}?email=notregistered@mergington.edu",
+                400,
+                "not signed up",
+                id="unregister-not-registered",
+            ),
+        ],
+    )
+    def test_error_paths(
+        self, client, reset_activities, method, url, expected_status, expected_substr
+    ):
+        """Test that invalid signup/unregister requests return the right error"""
+        response = getattr(client, method)(url)
+        assert_message_contains(response, expected_status, expected_substr)
 
 
 class TestRootEndpoint:
@@ -247,6 +278,13 @@ class TestRootEndpoint:
 
     def test_root_redirects_to_static_index(self):
         """Test that root endpoint redirects to static/index.html"""
-        response = client.get("/", follow_redirects=False)
+        route = next(
+            route for route in app.routes
+            if route.path == "/" and "GET" in route.methods
+        )
+        # The handler is synchronous, so call it directly instead of going
+        # through the ASGI stack
+        response = route.endpoint()
+        assert isinstance(response, RedirectResponse)
         assert response.status_code == 307
-        assert "/static/index.html" in response.headers["location"]
+        assert response.headers["location"] == "/static/index.html"